@@ -3,7 +3,7 @@
 Daily Knowledge Bot
 
 This script uses the Perplexity API to fetch an interesting fact and the
-Google Vertex AI API to generate a relevant image. It can post this content
+Google Gemini API to generate a relevant image. It can post this content
 to a LinkedIn personal profile or company page.
 
 Usage:
@@ -15,9 +15,11 @@ Usage:
 
 Requirements:
   - requests
+  - orjson
+  - brotli
   - python-dotenv
-  - google-cloud-aiplatform
-  - Pillow
+  - google-genai
+  - Pillow (or the drop-in pillow-simd for faster resizing/compositing)
 """
 
 import os
@@ -27,19 +29,29 @@ import random
 import logging
 import argparse
 import re
+import mimetypes
+import hashlib
+import functools
+import time
+import threading
 from abc import ABC, abstractmethod
-from datetime import datetime, date
-from PIL import Image
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from io import BytesIO
-from typing import Dict, List, Optional, Union, Any
+from urllib.parse import urlsplit
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple, Union, Any
 
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
-from google.oauth2 import service_account
-from vertexai.preview.vision_models import ImageGenerationModel
-from google.cloud import aiplatform
-from google import genai
+
+# Pillow and the Google SDKs are imported where they are used, so text-only
+# runs don't pay their import cost.
+if TYPE_CHECKING:
+    from PIL import Image
 
 # --- Configure logging ---
 logging.basicConfig(
@@ -52,6 +64,31 @@ logging.basicConfig(
 )
 logger = logging.getLogger("daily_knowledge_bot")
 
+# Characters that are not allowed in generated file names
+UNSAFE_FILENAME_RE = re.compile(r"[^a-z0-9]+")
+
+# Reference-style citations the model sometimes adds, e.g. [1], [2], [X]
+CITATION_RE = re.compile(r"[ \t]*\[\w+\][ \t]*")
+
+# Runs of spaces/tabs, and line breaks with any surrounding whitespace
+INLINE_WHITESPACE_RE = re.compile(r"[ \t]+")
+LINE_BREAK_RE = re.compile(r"\s*\n\s*")
+
+# Words, for comparing facts
+WORD_RE = re.compile(r"\w+")
+
+# Trailing "Source article here - <url>" line of a generated post
+SOURCE_TAIL_RE = re.compile(r"Source article here -\s*\S+\s*$", re.IGNORECASE)
+
+def slugify(text: str) -> str:
+    """Turns free text (e.g. a topic) into a short, file-name-safe slug."""
+    return UNSAFE_FILENAME_RE.sub("_", text.lower()).strip("_")[:40]
+
+def word_shingles(text: str, size: int = 3) -> frozenset:
+    """Returns the set of lower-cased word n-grams in a text, for near-duplicate checks."""
+    words = WORD_RE.findall(text.lower())
+    return frozenset(zip(*(words[i:] for i in range(size))))
+
 # --- Custom Exceptions ---
 class ConfigurationError(Exception):
     """Exception raised for errors in the configuration."""
@@ -61,84 +98,368 @@ class LinkedInError(Exception):
     """Exception raised for errors posting to LinkedIn."""
     pass
 
+# --- HTTP Session ---
+def create_session(headers: Dict[str, str], retry_methods: Tuple[str, ...] = ("GET", "PUT"),
+                   read_retries: Optional[int] = None) -> requests.Session:
+    """
+    Creates a pooled HTTP session so successive calls to the same host reuse
+    one keep-alive connection instead of paying a new TCP/TLS handshake.
+    
+    Rate-limited (429) and 5xx responses are retried with exponential backoff,
+    honouring the server's Retry-After header.
+    
+    The session stays on HTTP/1.1, which requests supports natively. A --batch
+    run sends up to PERPLEXITY_MAX_CONCURRENCY requests to Perplexity at once,
+    and the pool keeps one keep-alive connection per in-flight request, so each
+    handshake is paid once per run. HTTP/2 multiplexing would only save those
+    few handshakes, against completions that take seconds each, and would need
+    a different HTTP client.
+    
+    Args:
+        headers: Default headers sent with every request on the session
+        retry_methods: HTTP methods that are safe to retry for this API
+        read_retries: How often to resend a request whose response timed out or broke
+            off mid-read; None allows as many as the overall retry budget
+        
+    Returns:
+        requests.Session: A session with a retrying, pooled HTTPS adapter mounted
+    """
+    session = requests.Session()
+    session.headers.update(headers)
+    retry = Retry(
+        total=5,
+        backoff_factor=1.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=retry_methods,
+        read=read_retries,
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    # pool_maxsize covers the worker threads of a batch run sharing one session
+    adapter = HTTPAdapter(pool_connections=2, pool_maxsize=8, max_retries=retry)
+    session.mount("https://", adapter)
+    return session
+
+def post_json(session: requests.Session, url: str, payload: Dict[str, Any], **kwargs) -> requests.Response:
+    """POSTs a JSON payload serialized with orjson, which is faster than the stdlib encoder requests uses."""
+    headers = {"Content-Type": "application/json", **(kwargs.pop("headers", None) or {})}
+    return session.post(url, data=orjson.dumps(payload), headers=headers, **kwargs)
+
+# --- Response Cache ---
+def cached_step(step: str, per_day: bool = True):
+    """
+    Caches a PerplexityClient method's result on disk.
+    
+    The cache key covers the step name, the call arguments and, for per-day
+    steps, the client's run_date, so re-running the bot on the same day (e.g. preview,
+    then post) reuses the earlier responses instead of calling the API again.
+    Steps whose output only depends on their arguments (like summarizing a
+    given URL) can set per_day=False to be reused across days. Empty results
+    are not cached.
+    
+    Args:
+        step: Name of the workflow step, used as part of the cache key
+        per_day: If True, cached results expire at the end of the day
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            day = self.run_date if per_day else None
+            key_source = json.dumps([step, day, args, kwargs], sort_keys=True, default=sorted)
+            key = hashlib.blake2b(key_source.encode("utf-8"), digest_size=16).hexdigest()
+            cache_file = self.cache_dir / f"cache_{key}.json"
+            if cache_file.exists():
+                try:
+                    logger.info(f"Using cached result for step '{step}'")
+                    return orjson.loads(cache_file.read_bytes())
+                except Exception as e:
+                    logger.warning(f"Failed to read cache file {cache_file}: {e}")
+            
+            result = method(self, *args, **kwargs)
+            if result:
+                try:
+                    self.cache_dir.mkdir(parents=True, exist_ok=True)
+                    cache_file.write_bytes(orjson.dumps(result))
+                except Exception as e:
+                    logger.warning(f"Failed to write cache file {cache_file}: {e}")
+            return result
+        return wrapper
+    return decorator
+
+def prune_cache(cache_dir: Path, max_age_days: int) -> int:
+    """
+    Deletes cached step results older than max_age_days.
+    
+    Per-day entries are useless after their day, and entries that carry over
+    (like summaries) are rarely reused after a few weeks, so without pruning
+    the cache directory only grows.
+    
+    Returns:
+        int: The number of cache files removed
+    """
+    cutoff = time.time() - max_age_days * 86400
+    removed = 0
+    for cache_file in cache_dir.glob("cache_*.json"):
+        try:
+            if cache_file.stat().st_mtime < cutoff:
+                cache_file.unlink()
+                removed += 1
+        except OSError as e:
+            logger.warning(f"Failed to prune cache file {cache_file}: {e}")
+    if removed:
+        logger.info(f"Pruned {removed} cached results older than {max_age_days} days")
+    return removed
+
 # --- API Clients ---
 class PerplexityClient:
     """Client for interacting with the Perplexity API."""
     BASE_URL = "https://api.perplexity.ai/chat/completions"
+    # Sites that don't make good article sources (matched on the host and its subdomains)
+    BLOCKED_DOMAINS = frozenset({"wikipedia.org", "youtube.com", "youtu.be"})
+    # Models for finding/summarizing articles and for writing posts. Both, and
+    # PROMPT_VERSION, are part of the cache keys, so bump PROMPT_VERSION whenever
+    # a prompt changes to stop serving results produced by the old one.
+    SEARCH_MODEL = "sonar-pro"
+    WRITING_MODEL = "sonar"
+    PROMPT_VERSION = 1
+    # How many previously used URLs to name in the article search prompt
+    MAX_PROMPT_EXCLUSIONS = 50
+    # (connect, read) timeouts: fail fast on an unreachable host, but give the model
+    # time to search and read articles, since nothing is sent until the answer is ready
+    TIMEOUT = (5, 90)
+    # Cached step results older than this are deleted when the client starts
+    CACHE_MAX_AGE_DAYS = 30
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, cache_dir: Path = Path("facts"), max_concurrency: int = 4):
         if not api_key or "YOUR_PERPLEXITY_API_KEY_HERE" in api_key:
             raise ConfigurationError("Perplexity API key is not configured.")
+        if max_concurrency < 1:
+            # A zero-sized semaphore would block the first request forever
+            raise ConfigurationError(f"Perplexity max concurrency must be at least 1, got {max_concurrency}.")
         self.api_key = api_key
+        self.cache_dir = cache_dir
+        prune_cache(self.cache_dir, self.CACHE_MAX_AGE_DAYS)
+        # Fixed for the client's lifetime so every step of a run shares one cache day.
+        # DailyKnowledgeService reuses it for its file names, so both agree on the day.
+        self.run_started_at = datetime.now()
+        self.run_date = self.run_started_at.date().isoformat()
         self.headers = {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        # Chat completions have no side effects, so POSTs are safe to retry on
+        # connection errors and 429/5xx. A stalled completion is not resent: each
+        # attempt would wait out the full read timeout and be billed again.
+        self.session = create_session(self.headers, retry_methods=("GET", "POST"), read_retries=0)
+        # Caps in-flight requests across threads (e.g. --batch) so a fan-out
+        # doesn't run into the API's rate limit and spend its time in retries
+        self._request_slots = threading.BoundedSemaphore(max_concurrency)
 
-    def get_article_url(self, topic: str, used_urls: set) -> Optional[str]:
+    def _chat_completion(self, data: Dict[str, Any]) -> str:
+        """
+        Sends a chat completion request and returns the message content.
+        
+        max_tokens is kept close to the expected output size to cut decode time.
+        If the model still runs out of budget (finish_reason == "length"), the
+        request is retried once with a 50% larger budget.
+        
+        Args:
+            data: The request body
+            
+        Returns:
+            str: The content of the first choice's message
+        """
+        data = {**data, "stream": False}
+        with self._request_slots:
+            response = post_json(self.session, self.BASE_URL, data, timeout=self.TIMEOUT)
+        response.raise_for_status()
+        logger.debug(f"Perplexity response: {len(response.content)} bytes")
+        choice = orjson.loads(response.content)["choices"][0]
+        
+        if choice.get("finish_reason") == "length":
+            data["max_tokens"] = int(data["max_tokens"] * 1.5)
+            logger.info(f"Response hit the token limit, retrying with max_tokens={data['max_tokens']}")
+            with self._request_slots:
+                response = post_json(self.session, self.BASE_URL, data, timeout=self.TIMEOUT)
+            response.raise_for_status()
+            choice = orjson.loads(response.content)["choices"][0]
+        
+        return choice["message"]["content"]
+
+    def _is_blocked_host(self, host: str) -> bool:
+        """Checks a (lower-cased) host name against BLOCKED_DOMAINS, including subdomains."""
+        if host in self.BLOCKED_DOMAINS:
+            return True
+        return any(host.endswith("." + domain) for domain in self.BLOCKED_DOMAINS)
+
+    def _is_acceptable_url(self, url: str, used_urls: set) -> bool:
+        """Checks that a model-suggested URL is a well-formed, unused link on an allowed site."""
+        parts = urlsplit(url)
+        host = parts.hostname or ""
+        return (parts.scheme in ("http", "https") and 
+                bool(host) and 
+                " " not in url and 
+                url not in used_urls and 
+                not self._is_blocked_host(host))
+
+    def _prompt_exclusions(self, used_urls: set, recent_urls: Optional[Sequence[str]]) -> List[str]:
+        """
+        Returns the used URLs to name in an article search prompt.
+        
+        Listing the whole history would grow the prompt (and its cost) with every run,
+        so only the MAX_PROMPT_EXCLUSIONS most recent URLs are named.
+        """
+        recent = list(recent_urls if recent_urls is not None else used_urls)
+        return recent[-self.MAX_PROMPT_EXCLUSIONS:]
+
+    @cached_step(f"get_article_and_summary:{SEARCH_MODEL}:v{PROMPT_VERSION}")
+    def get_article_and_summary(self, topic: str, used_urls: set,
+                                recent_urls: Optional[Sequence[str]] = None) -> Optional[Tuple[str, str]]:
+        """
+        Finds an unused article for a topic and summarizes it in a single request.
+        
+        This saves the separate summarize round trip. If the model's answer
+        can't be parsed or its URL is rejected, None is returned and the caller
+        falls back to get_article_url and summarize_article. Request errors,
+        including timeouts, are raised instead.
+        
+        Args:
+            topic: The topic to find an article about
+            used_urls: Set of already used article URLs to avoid
+            recent_urls: Most recently used URLs, oldest first, to list in the prompt
+            
+        Returns:
+            Optional[Tuple[str, str]]: The article URL and its summary, or None
+        """
+        excluded_urls = self._prompt_exclusions(used_urls, recent_urls)
+        blocked_sites = ", ".join(sorted(self.BLOCKED_DOMAINS))
+        data = {
+            "model": self.SEARCH_MODEL,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are a research assistant. Find a single, highly relevant, and verifiable "
+                              "online article for the given topic, read it, and summarize its key finding or "
+                              "main point in under 100 words. "
+                              f"The article must not be any of these: {', '.join(excluded_urls) if excluded_urls else 'none'}. "
+                              f"Do not use these sites: {blocked_sites}. "
+                              'Respond with ONLY a JSON object of the form {"url": "...", "summary": "..."}.'
+                },
+                {"role": "user", "content": f"Find and summarize one interesting article about {topic}."}
+            ],
+            "response_format": {
+                "type": "json_schema",
+                "json_schema": {
+                    "schema": {
+                        "type": "object",
+                        "properties": {"url": {"type": "string"}, "summary": {"type": "string"}},
+                        "required": ["url", "summary"]
+                    }
+                }
+            },
+            "max_tokens": 240,
+            "temperature": 0.2
+        }
+        
+        try:
+            # Strip a markdown code fence in case the model wraps the JSON anyway
+            content = self._chat_completion(data).strip().strip("`")
+            if content.startswith("json"):
+                content = content[len("json"):]
+            result = orjson.loads(content)
+            url, summary = result["url"].strip(), result["summary"].strip()
+        except requests.RequestException:
+            # Network failures and timeouts are already retried by the session where
+            # safe; falling back would resend the same stalled request
+            raise
+        except Exception as e:
+            logger.warning(f"Combined article search and summary failed: {e}")
+            return None
+        
+        if not summary or not self._is_acceptable_url(url, used_urls):
+            logger.warning(f"Rejected article URL from combined search: {url}")
+            return None
+        return url, summary
+
+    @cached_step(f"get_article_url:{SEARCH_MODEL}:v{PROMPT_VERSION}")
+    def get_article_url(self, topic: str, used_urls: set, recent_urls: Optional[Sequence[str]] = None) -> Optional[str]:
         """
         Find a single, relevant article URL for a given topic that hasn't been used before.
         
         Args:
             topic: The topic to find an article about
             used_urls: Set of already used article URLs to avoid
+            recent_urls: Most recently used URLs, oldest first, to list in the prompt.
+                Only the last MAX_PROMPT_EXCLUSIONS are sent; older ones are still
+                rejected by the used_urls check
             
         Returns:
             Optional[str]: A URL to a relevant article, or None if no suitable article is found
         """
         max_attempts = 3
         attempts = 0
+        # URLs rejected during this call are excluded explicitly in the next prompt,
+        # so the model doesn't spend another attempt on the same answer
+        excluded_urls = self._prompt_exclusions(used_urls, recent_urls)
+        blocked_sites = ", ".join(sorted(self.BLOCKED_DOMAINS))
         
         while attempts < max_attempts:
             data = {
-                "model": "sonar-pro",
+                "model": self.SEARCH_MODEL,
                 "messages": [
                     {
                         "role": "system", 
                         "content": "You are a search assistant. Your sole purpose is to find a single, "
                                   "highly relevant, and verifiable online article for the given topic. "
-                                  f"The article must not be any of these: {', '.join(used_urls) if used_urls else 'none'}. "
+                                  f"The article must not be any of these: {', '.join(excluded_urls) if excluded_urls else 'none'}. "
+                                  f"Do not use these sites: {blocked_sites}. "
                                   "Respond with ONLY the URL and nothing else."
                     },
                     {"role": "user", "content": f"Find one interesting article about {topic}."}
                 ],
-                "max_tokens": 150, 
+                "max_tokens": 64, 
                 "temperature": 0.2
             }
             
             try:
-                response = requests.post(self.BASE_URL, headers=self.headers, json=data, timeout=30)
-                response.raise_for_status()
-                url = response.json()["choices"][0]["message"]["content"].strip()
+                url = self._chat_completion(data).strip()
                 
                 # Verify the URL is valid and not already used
-                if (url.startswith("http") and 
-                    " " not in url and 
-                    url not in used_urls and 
-                    not any(domain in url for domain in ['wikipedia.org', 'youtube.com', 'youtu.be'])):
+                if self._is_acceptable_url(url, used_urls):
                     return url
+                
+                logger.warning(f"Rejected article URL (attempt {attempts + 1}): {url}")
+                if url not in excluded_urls:
+                    excluded_urls.append(url)
                     
+            except requests.RequestException:
+                # Only unusable answers are worth asking again for; a timed-out or
+                # failed request would wait out the same timeout and be billed again
+                raise
             except Exception as e:
                 logger.warning(f"Error fetching article URL (attempt {attempts + 1}): {e}")
+                # Back off before asking again (0.5s, 1s, ...); rate limits are already
+                # retried by the session with Retry-After
+                if attempts + 1 < max_attempts:
+                    time.sleep(0.5 * 2 ** attempts)
             
             attempts += 1
             
         logger.error(f"Failed to find a new article after {max_attempts} attempts")
         return None
 
+    @cached_step(f"summarize_article:{SEARCH_MODEL}:v{PROMPT_VERSION}", per_day=False)
     def summarize_article(self, article_url: str) -> str:
         """Step 2: Summarize the content of a given article URL."""
         data = {
-            "model": "sonar-pro",
+            "model": self.SEARCH_MODEL,
             "messages": [
                 {"role": "system", "content": "You are a summarization assistant. Read the content of the provided URL and provide a concise, interesting summary of the key finding or main point. The summary should be under 100 words."},
                 {"role": "user", "content": f"Please summarize this article: {article_url}"}
             ],
-            "max_tokens": 200, "temperature": 0.7
+            "max_tokens": 160, "temperature": 0.7
         }
-        response = requests.post(self.BASE_URL, headers=self.headers, json=data, timeout=30)
-        response.raise_for_status()
-        return response.json()["choices"][0]["message"]["content"].strip()
+        return self._chat_completion(data).strip()
 
     def generate_human_linkedin_post(self, topic: str, fact: str, sources: List[str]) -> str:
         """
@@ -151,6 +472,9 @@ class PerplexityClient:
             
         Returns:
             Formatted LinkedIn post text with a personal touch
+            
+        Raises:
+            requests.RequestException: If the Perplexity request fails
         """
         system_prompt = """You are a professional creating engaging LinkedIn posts. 
 Write in a natural, conversational tone as if sharing insights with colleagues.
@@ -183,42 +507,28 @@ Guidelines:
 - Follow the formatting rules exactly"""
 
         data = {
-            "model": "sonar",
+            "model": self.WRITING_MODEL,
             "messages": [
                 {"role": "system", "content": system_prompt},
                 {"role": "user", "content": user_prompt}
             ],
-            "max_tokens": 500,
+            "max_tokens": 300,
             "temperature": 0.7
         }
         
-        try:
-            response = requests.post(self.BASE_URL, headers=self.headers, json=data, timeout=30)
-            response.raise_for_status()
-            content = response.json()["choices"][0]["message"]["content"]
-            
-            # Clean up any markdown or unwanted formatting
-            content = content.replace('•', '').replace('-', '').strip()
-            # Remove reference-style citations like [X] or [1], [2], etc.
-            content = re.sub(r'\s*\[\d+\]\s*', ' ', content)  # [1], [2], etc.
-            content = re.sub(r'\s*\[X\]\s*', ' ', content)    # [X]
-            content = re.sub(r'\s*\[\w+\]\s*', ' ', content)  # Any other single-letter references
-            
-            # Clean up multiple spaces and normalize newlines
-            content = ' '.join(content.split())  # Remove extra spaces
-            content = '\n\n'.join([p.strip() for p in content.split('\n') if p.strip()])
-            
-            # Ensure the source is included with proper spacing
-            source_line = f"\n\nSource article here - {sources[0]}"
-            if not re.search(r'Source article here -\s*' + re.escape(sources[0]) + r'\s*$', content, re.IGNORECASE):
-                content = f"{content.rstrip()}{source_line}"
-            
-            return content.strip()
-            
-        except Exception as e:
-            logger.error(f"Error generating human-like post: {e}")
-            # Fallback to simple formatting with proper line breaks
-            return f"{topic.upper()}\n\n{fact}\n\nSource article here - {sources[0]}"
+        # Drop any source line the model wrote; the canonical one is appended below
+        content = SOURCE_TAIL_RE.sub('', self._chat_completion(data))
+        
+        # Clean up any markdown or unwanted formatting
+        content = content.replace('•', '').replace('-', '').strip()
+        # Remove reference-style citations like [X] or [1], [2], etc.
+        content = CITATION_RE.sub(' ', content)
+        
+        # Collapse repeated spaces and turn every line break into a paragraph break
+        content = INLINE_WHITESPACE_RE.sub(' ', content)
+        content = LINE_BREAK_RE.sub('\n\n', content).strip()
+        
+        return f"{content}\n\nSource article here - {sources[0]}"
 
     def generate_linkedin_post_text(self, topic: str, fact: str, sources: List[str], human_like: bool = False) -> str:
         """
@@ -231,8 +541,18 @@ Guidelines:
             human_like: If True, generates a more personal, conversational post
             
         Returns:
-            Formatted LinkedIn post text
+            Formatted LinkedIn post text, or a plain fallback post if generation fails
         """
+        try:
+            return self._compose_linkedin_post(topic, fact, sources, human_like)
+        except Exception as e:
+            logger.error(f"Error generating {'human-like ' if human_like else ''}LinkedIn post: {e}")
+            # Fallback to simple formatting if there's an error (not cached, so a rerun tries again)
+            return f"{topic.upper()}\n\n{fact}\n\nSource article here - {sources[0]}"
+
+    @cached_step(f"generate_linkedin_post_text:{WRITING_MODEL}:v{PROMPT_VERSION}", per_day=False)
+    def _compose_linkedin_post(self, topic: str, fact: str, sources: List[str], human_like: bool) -> str:
+        """Generates the post text via Perplexity, raising on API errors."""
         if human_like:
             return self.generate_human_linkedin_post(topic, fact, sources)
             
@@ -287,70 +607,67 @@ Guidelines:
         """
         
         data = {
-            "model": "sonar",
+            "model": self.WRITING_MODEL,
             "messages": [
                 {"role": "system", "content": system_prompt.strip()},
                 {"role": "user", "content": user_prompt.strip()}
             ],
-            "max_tokens": 500,
+            "max_tokens": 400,
             "temperature": 0.7
         }
         
-        try:
-            response = requests.post(self.BASE_URL, headers=self.headers, json=data, timeout=30)
-            response.raise_for_status()
-            content = response.json()["choices"][0]["message"]["content"]
-            
-            # Ensure the source is included
-            if not re.search(r'Source article here -\s*' + re.escape(sources[0]) + r'\s*$', content, re.IGNORECASE):
-                content = f"{content.rstrip()}\n\n\nSource article here - {sources[0]}"
-                
-            return content.strip()
-            
-        except Exception as e:
-            logger.error(f"Error generating LinkedIn post: {e}")
-            # Fallback to simple formatting if there's an error
-            return f"{topic.upper()}\n\n{fact}\n\nSource article here - {sources[0]}"
+        # Replace whatever source line the model wrote with the canonical one
+        content = SOURCE_TAIL_RE.sub('', self._chat_completion(data)).strip()
+        return f"{content}\n\n\nSource article here - {sources[0]}"
 
 class ImageGenerationClient(ABC):
     """Abstract base class for image generation clients."""
     
     @abstractmethod
-    def generate_image(self, topic: str, output_dir: Path) -> Optional[Path]:
+    def generate_image(self, topic: str, output_dir: Path, timestamp: Optional[str] = None) -> Optional[Path]:
         """Generate an image for the given topic and save it to the output directory."""
         pass
 
 
 class GeminiImageClient(ImageGenerationClient):
     """Client for generating images using Google's Gemini API."""
+    MODEL = "gemini-2.5-flash-image-preview"
+    # Image formats that are saved as returned, without re-encoding
+    EXTENSIONS = {"image/png": ".png", "image/jpeg": ".jpg"}
+    PROMPT_TEMPLATE = (
+        "Create a professional, high-detail image representing '{topic}'. "
+        "The style should be modern, clean, and visually striking, suitable for a LinkedIn post. "
+        "Focus on a composition that is both artistic and clearly communicates the subject. "
+        "Avoid text, watermarks, or distracting elements. The lighting should be bright and natural."
+    )
 
     def __init__(self, api_key: str):
         if not api_key or "YOUR_GOOGLE_API_KEY" in api_key:
             raise ConfigurationError("Google API key is not configured.")
         try:
             logger.info("Initializing Gemini API for image generation...")
+            from google import genai
             self.client = genai.Client(api_key=api_key)
+            # Resolve the models service once instead of on every request
+            self.models = self.client.models
         except Exception as e:
             raise ConfigurationError(f"Failed to initialize Gemini API: {e}")
 
-    def generate_image(self, topic: str, output_dir: Path) -> Optional[Path]:
+    def generate_image(self, topic: str, output_dir: Path, timestamp: Optional[str] = None) -> Optional[Path]:
         """
         Generates a high-quality image based on a topic using Gemini API.
+        
+        The file name uses the given timestamp (YYYYmmdd_HHMMSS), or the current time if omitted.
         """
-        prompt = (
-            f"Create a professional, high-detail image representing '{topic}'. "
-            f"The style should be modern, clean, and visually striking, suitable for a LinkedIn post. "
-            f"Focus on a composition that is both artistic and clearly communicates the subject. "
-            f"Avoid text, watermarks, or distracting elements. The lighting should be bright and natural."
-        )
+        prompt = self.PROMPT_TEMPLATE.format(topic=topic)
 
         try:
             logger.info(f"Generating image for topic: {topic}...")
             logger.debug(f"Using prompt: {prompt}")
 
             # Generate the image
-            response = self.client.models.generate_content(
-                model="gemini-2.5-flash-image-preview",
+            response = self.models.generate_content(
+                model=self.MODEL,
                 contents=[prompt],
             )
             
@@ -360,14 +677,20 @@ class GeminiImageClient(ImageGenerationClient):
                     # Create output directory if it doesn't exist
                     output_dir.mkdir(parents=True, exist_ok=True)
                     
-                    # Generate a filename with timestamp
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    filename = f"{topic.replace(' ', '_').lower()}_{timestamp}.png"
-                    image_path = output_dir / filename
+                    # Generate a filename with timestamp, keeping the format Gemini returned
+                    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
+                    mime_type = getattr(part.inline_data, "mime_type", None) or "image/png"
+                    extension = self.EXTENSIONS.get(mime_type, ".png")
+                    image_path = output_dir / f"{slugify(topic)}_{timestamp}{extension}"
                     
-                    # Save the image
-                    image = Image.open(BytesIO(part.inline_data.data))
-                    image.save(image_path)
+                    # Save the image, writing PNG/JPEG bytes as-is to avoid a decode/re-encode
+                    data = part.inline_data.data
+                    if mime_type in self.EXTENSIONS:
+                        image_path.write_bytes(data)
+                    else:
+                        from PIL import Image
+                        from io import BytesIO
+                        Image.open(BytesIO(data)).save(image_path)
                     
                     logger.info(f"Image saved to {image_path}")
                     return image_path
@@ -379,38 +702,6 @@ class GeminiImageClient(ImageGenerationClient):
             logger.error(f"Failed to generate image: {e}")
             return None
 
-# --- Helper Functions ---
-def add_logo_to_image(base_image_path: Path, logo_path: Path, output_path: Path):
-    """Overlays a logo onto the bottom-right corner of a base image."""
-    try:
-        logger.info(f"Opening base image: {base_image_path}")
-        base_image = Image.open(base_image_path).convert("RGBA")
-        
-        logger.info(f"Opening logo image: {logo_path}")
-        logo = Image.open(logo_path).convert("RGBA")
-
-        base_width, base_height = base_image.size
-        logo_width = int(base_width * 0.20)
-        logo_ratio = logo_width / float(logo.size[0])
-        logo_height = int(float(logo.size[1]) * float(logo_ratio))
-        logo = logo.resize((logo_width, logo_height), Image.Resampling.LANCZOS)
-
-        padding_x = int(base_width * 0.02)
-        padding_y = int(base_height * 0.02)
-        position = (base_width - logo_width - padding_x, base_height - logo_height - padding_y)
-
-        transparent_layer = Image.new("RGBA", base_image.size, (0, 0, 0, 0))
-        transparent_layer.paste(logo, position)
-
-        watermarked_image = Image.alpha_composite(base_image, transparent_layer)
-        watermarked_image.convert("RGB").save(output_path)
-        logger.info(f"Successfully added logo and saved to: {output_path}")
-
-    except FileNotFoundError:
-        logger.warning(f"Logo file not found at '{logo_path}'. Skipping logo addition.")
-    except Exception as e:
-        logger.error(f"Could not add logo to image: {e}")
-
 class LinkedInClient:
     """Client for posting updates to LinkedIn."""
     API_URL = "https://api.linkedin.com/v2"
@@ -421,9 +712,30 @@ class LinkedInClient:
         self.access_token = access_token
         self.person_id = person_id
         self.organization_id = organization_id
+        # None when the ID is missing or still the .env.example placeholder
+        self.person_urn = f"urn:li:person:{person_id}" if self._is_configured(person_id) else None
+        self.organization_urn = f"urn:li:organization:{organization_id}" if self._is_configured(organization_id) else None
         self.headers = {
             "Authorization": f"Bearer {self.access_token}",
         }
+        self.session = create_session(self.headers)
+
+    @staticmethod
+    def _is_configured(value: Optional[str]) -> bool:
+        """Checks that a LinkedIn ID from the environment is set and not a placeholder."""
+        return bool(value) and not value.startswith("YOUR_")
+
+    def require_author(self, is_company: bool):
+        """
+        Checks that the ID needed to post as the person or the company is configured.
+        
+        Raises:
+            ConfigurationError: If the person or organization ID is missing
+        """
+        if is_company and not self.organization_urn:
+            raise ConfigurationError("LinkedIn organization ID is not configured (LINKEDIN_ORGANIZATION_ID).")
+        if not is_company and not self.person_urn:
+            raise ConfigurationError("LinkedIn person ID is not configured (LINKEDIN_PERSON_ID).")
 
     def upload_image(self, image_path: Path, is_company: bool = False) -> str:
         """
@@ -436,11 +748,14 @@ class LinkedInClient:
         Returns:
             str: The asset URN for the uploaded image
         """
+        # Stat the file up front so a missing image fails before an asset is registered
+        image_size = image_path.stat().st_size
+        
         # Step 1: Register the upload
         register_upload_url = f"{self.API_URL}/assets?action=registerUpload"
         
         # Set the owner based on whether this is a company post or not
-        owner = f"urn:li:organization:{self.organization_id}" if is_company else f"urn:li:person:{self.person_id}"
+        owner = self.organization_urn if is_company else self.person_urn
         
         register_body = {
             "registerUploadRequest": {
@@ -454,17 +769,24 @@ class LinkedInClient:
                 ]
             }
         }
-        response = requests.post(register_upload_url, headers=self.headers, json=register_body, timeout=30)
+        response = post_json(self.session, register_upload_url, register_body, timeout=30)
         if response.status_code != 200:
             raise LinkedInError(f"Failed to register image upload: {response.text}")
-        upload_data = response.json()["value"]
+        upload_data = orjson.loads(response.content)["value"]
         asset_urn = upload_data["asset"]
         upload_url = upload_data["uploadMechanism"]["com.linkedin.digitalmedia.uploading.MediaUploadHttpRequest"]["uploadUrl"]
 
-        # Step 2: Upload the image file
-        image_headers = {'Authorization': f'Bearer {self.access_token}'}
+        # Step 2: Stream the image file from disk (the session already carries the Authorization header).
+        # An explicit Content-Length keeps requests from falling back to buffering or chunked encoding.
+        # A raw socket.sendfile() would not save a copy here: the upload URL is HTTPS and Python's
+        # SSL sockets encrypt in userspace, so sendfile falls back to plain send() anyway.
+        image_headers = {
+            "Content-Length": str(image_size),
+            "Content-Type": mimetypes.guess_type(image_path.name)[0] or "application/octet-stream",
+        }
+        # If the PUT is retried, urllib3 rewinds the file to its starting position before resending.
         with open(image_path, 'rb') as f:
-            upload_response = requests.put(upload_url, headers=image_headers, data=f, timeout=60)
+            upload_response = self.session.put(upload_url, headers=image_headers, data=f, timeout=60)
         
         if upload_response.status_code not in [200, 201]:
             raise LinkedInError(f"Failed to upload image: {upload_response.text}")
@@ -472,185 +794,215 @@ class LinkedInClient:
         logger.info(f"Image uploaded successfully. Asset URN: {asset_urn}")
         return asset_urn
 
-    def post_as_person(self, text: str, image_path: Optional[Path] = None):
-        """Posts an update to a personal LinkedIn profile."""
-        post_url = f"{self.API_URL}/ugcPosts"
-        post_body = {
-            "author": f"urn:li:person:{self.person_id}",
-            "lifecycleState": "PUBLISHED",
-            "specificContent": {
-                "com.linkedin.ugc.ShareContent": {
-                    "shareCommentary": {"text": text},
-                    "shareMediaCategory": "NONE"
+    def _build_post_body(self, author_urn: str, text: str, image_urn: Optional[str] = None) -> Dict[str, Any]:
+        """Build a ugcPosts request body, attaching the uploaded image if there is one."""
+        share_content = {
+            "shareCommentary": {"text": text},
+            "shareMediaCategory": "IMAGE" if image_urn else "NONE"
+        }
+        if image_urn:
+            share_content["media"] = [
+                {
+                    "status": "READY",
+                    "description": {
+                        "text": "Daily knowledge share image"
+                    },
+                    "media": image_urn,
+                    "title": {
+                        "text": "Daily Knowledge Share"
+                    }
                 }
-            },
+            ]
+        return {
+            "author": author_urn,
+            "lifecycleState": "PUBLISHED",
+            "specificContent": {"com.linkedin.ugc.ShareContent": share_content},
             "visibility": {"com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"}
         }
+
+    def _upload_image_or_none(self, image_path: Optional[Path], is_company: bool) -> Optional[str]:
+        """Upload image_path if given, returning None instead of failing the post if the upload fails."""
+        if not image_path:
+            return None
+        try:
+            return self.upload_image(image_path, is_company=is_company)
+        except Exception as e:
+            logger.error(f"Error uploading image: {e}")
+            # Continue without image if upload fails
+            return None
+
+    def _submit_post(self, post_body: Dict[str, Any], extra_headers: Optional[Dict[str, str]] = None):
+        """
+        Publish a post built by _build_post_body.
         
-        # Handle image upload if provided
-        if image_path:
-            try:
-                # Upload image with person as owner
-                image_urn = self.upload_image(image_path, is_company=False)
-                
-                # Update post body with image
-                post_body["specificContent"]["com.linkedin.ugc.ShareContent"]["shareMediaCategory"] = "IMAGE"
-                post_body["specificContent"]["com.linkedin.ugc.ShareContent"]["media"] = [
-                    {
-                        "status": "READY",
-                        "description": {
-                            "text": "Daily knowledge share image"
-                        },
-                        "media": image_urn,
-                        "title": {
-                            "text": "Daily Knowledge Share"
-                        }
-                    }
-                ]
-                
-            except Exception as e:
-                logger.error(f"Error uploading image: {e}")
-                # Continue without image if upload fails
+        Args:
+            post_body: The ugcPosts request body
+            extra_headers: Headers to send in addition to the session defaults
+            
+        Raises:
+            LinkedInError: If LinkedIn does not accept the post
+        """
+        try:
+            response = post_json(self.session, f"{self.API_URL}/ugcPosts", post_body, headers=extra_headers, timeout=30)
+        except requests.RequestException as e:
+            raise LinkedInError(f"Error making request to LinkedIn API: {e}") from e
+        if response.status_code == 201:
+            return
         
-        # Make the post
-        response = requests.post(post_url, headers=self.headers, json=post_body, timeout=30)
-        if response.status_code != 201:
-            raise LinkedInError(f"Failed to post to LinkedIn as person: {response.text}")
+        is_company = post_body["author"] == self.organization_urn
+        # Check for common permission issues
+        if response.status_code == 403 and is_company:
+            logger.error("\nThis is likely due to missing permissions. Please ensure that:")
+            logger.error("1. Your LinkedIn app has the 'w_organization_social' permission")
+            logger.error("2. Your access token has the correct scopes")
+            logger.error("3. Your LinkedIn app is approved for the Marketing Developer Platform")
+            logger.error("4. Your organization's admin has approved the app")
+        target = "company" if is_company else "person"
+        raise LinkedInError(f"Failed to post to LinkedIn as {target} (status {response.status_code}): {response.text}")
+
+    def post_as_person(self, text: str, image_path: Optional[Path] = None):
+        """Posts an update to a personal LinkedIn profile."""
+        image_urn = self._upload_image_or_none(image_path, is_company=False)
+        self._submit_post(self._build_post_body(self.person_urn, text, image_urn))
         logger.info("Successfully posted to LinkedIn personal profile.")
 
     def post_as_company(self, text: str, image_path: Optional[Path] = None):
         """Posts an update to a LinkedIn company page."""
-        post_url = f"{self.API_URL}/ugcPosts"
-        post_body = {
-            "author": f"urn:li:organization:{self.organization_id}",
-            "lifecycleState": "PUBLISHED",
-            "specificContent": {
-                "com.linkedin.ugc.ShareContent": {
-                    "shareCommentary": {"text": text},
-                    "shareMediaCategory": "NONE"
-                }
-            },
-            "visibility": {"com.linkedin.ugc.MemberNetworkVisibility": "PUBLIC"}
-        }
-        
-        # Handle image upload if provided
-        if image_path and image_path.exists():
-            try:
-                # Upload image with organization as owner
-                image_urn = self.upload_image(image_path, is_company=True)
-                
-                # Update post body with image
-                post_body["specificContent"]["com.linkedin.ugc.ShareContent"]["shareMediaCategory"] = "IMAGE"
-                post_body["specificContent"]["com.linkedin.ugc.ShareContent"]["media"] = [
-                    {
-                        "status": "READY",
-                        "description": {
-                            "text": "Daily knowledge share image"
-                        },
-                        "media": image_urn,
-                        "title": {
-                            "text": "Daily Knowledge Share"
-                        }
-                    }
-                ]
-                
-            except Exception as e:
-                logger.error(f"Error uploading image: {e}")
-                # Continue without image if upload fails
-        
-        try:
-            # Make the post
-            response = requests.post(
-                post_url, 
-                headers={
-                    **self.headers,
-                    "X-Restli-Protocol-Version": "2.0.0"
-                },
-                json=post_body, 
-                timeout=30
-            )
-            
-            if response.status_code == 201:
-                logger.info("Successfully posted to LinkedIn company page.")
-                return True
-            else:
-                logger.error(f"Failed to post to LinkedIn as company. Status: {response.status_code}")
-                logger.error(f"Response: {response.text}")
-                
-                # Check for common permission issues
-                if response.status_code == 403:
-                    logger.error("\nThis is likely due to missing permissions. Please ensure that:")
-                    logger.error("1. Your LinkedIn app has the 'w_organization_social' permission")
-                    logger.error("2. Your access token has the correct scopes")
-                    logger.error("3. Your LinkedIn app is approved for the Marketing Developer Platform")
-                    logger.error("4. Your organization's admin has approved the app")
-                
-                return False
-                
-        except Exception as e:
-            logger.error(f"Error making request to LinkedIn API: {str(e)}")
-            return False
+        image_urn = self._upload_image_or_none(image_path, is_company=True)
+        self._submit_post(
+            self._build_post_body(self.organization_urn, text, image_urn),
+            extra_headers={"X-Restli-Protocol-Version": "2.0.0"}
+        )
+        logger.info("Successfully posted to LinkedIn company page.")
 
 # --- Main Service --- 
 class DailyKnowledgeService:
     """Service to manage the daily workflow."""
-    def __init__(self, perplexity_client: PerplexityClient, image_client: GeminiImageClient, linkedin_client: Optional[LinkedInClient]):
+    # Posted facts compared against a new one, and the trigram overlap above
+    # which the new fact counts as a repeat
+    RECENT_FACTS_TO_CHECK = 90
+    DUPLICATE_FACT_SIMILARITY = 0.5
+
+    def __init__(self, perplexity_client: PerplexityClient, image_client: Optional[GeminiImageClient], linkedin_client: Optional[LinkedInClient]):
         self.perplexity_client = perplexity_client
         self.image_client = image_client
         self.linkedin_client = linkedin_client
         self.facts_dir = Path("facts")
         self.linkedin_posts_dir = Path("linkedin_posts")
         self.images_dir = Path("images")
-        self.used_articles_file = Path("used_articles.json")
+        # One JSON-encoded URL per line, so recording a URL is a single append
+        self.used_articles_file = Path("used_articles.ndjson")
+        self.legacy_used_articles_file = Path("used_articles.json")
+        # Facts that were actually posted, one JSON string per line; new facts are
+        # checked against these, not against drafts from previews or --batch
+        self.posted_facts_file = Path("posted_facts.ndjson")
         self.facts_dir.mkdir(exist_ok=True)
         self.linkedin_posts_dir.mkdir(exist_ok=True)
         self.images_dir.mkdir(exist_ok=True)
         self.topics = []
-        self.used_urls = self._load_used_articles()
+        self._daily_topic = None
+        used_urls = self._load_used_articles()
+        self.used_urls = set(used_urls)
+        # Newest URLs in file order, for the article search prompt
+        self.recent_urls = deque(used_urls, maxlen=PerplexityClient.MAX_PROMPT_EXCLUSIONS)
+        self.posted_facts = deque(self._load_posted_facts(), maxlen=self.RECENT_FACTS_TO_CHECK)
+        # Taken from the client so file names and cache keys share one date, even
+        # when a run crosses midnight
+        self._run_started_at = perplexity_client.run_started_at
+        self._run_date = self._run_started_at.date().isoformat()
+        self._run_ts = self._run_started_at.strftime("%Y%m%d_%H%M%S")
+        # Background writer so saving files doesn't delay the next API call
+        self._io_pool = ThreadPoolExecutor(max_workers=2)
         
-    def _load_used_articles(self) -> set:
-        """Load the set of already used article URLs."""
+    def _load_used_articles(self) -> List[str]:
+        """Load the already used article URLs, oldest first."""
         if not self.used_articles_file.exists():
-            return set()
+            return self._migrate_legacy_used_articles()
         
         try:
-            with open(self.used_articles_file, 'r') as f:
-                data = json.load(f)
-                return set(data.get('used_urls', []))
+            return read_ndjson(self.used_articles_file)
         except Exception as e:
             logger.warning(f"Failed to load used articles: {e}")
-            return set()
+            return []
+
+    def _migrate_legacy_used_articles(self) -> List[str]:
+        """Convert the old used_articles.json file to the append-only format, if present."""
+        if not self.legacy_used_articles_file.exists():
+            return []
+        
+        try:
+            with open(self.legacy_used_articles_file, 'r') as f:
+                used_urls = sorted(set(json.load(f).get('used_urls', [])))
+        except Exception as e:
+            logger.warning(f"Failed to load used articles: {e}")
+            return []
+        
+        try:
+            # Write to a temporary file and swap it in, so an interrupted migration leaves no partial file
+            tmp_file = self.used_articles_file.with_suffix(".tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.writelines(f"{json.dumps(url)}\n" for url in used_urls)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_file, self.used_articles_file)
+            logger.info(f"Migrated {len(used_urls)} used articles to {self.used_articles_file}")
+        except Exception as e:
+            logger.warning(f"Failed to migrate used articles: {e}")
+        return used_urls
             
     def _save_used_article(self, url: str):
-        """Save a new article URL to the used articles file."""
+        """Append a new article URL to the used articles file."""
+        if url in self.used_urls and self.used_articles_file.exists():
+            return
         self.used_urls.add(url)
-        data = {
-            'last_updated': datetime.now().isoformat(),
-            'used_urls': list(self.used_urls)
-        }
+        self.recent_urls.append(url)
         try:
-            with open(self.used_articles_file, 'w') as f:
-                json.dump(data, f, indent=2)
+            append_ndjson(self.used_articles_file, url)
         except Exception as e:
             logger.error(f"Failed to save used article: {e}")
 
+    def _load_posted_facts(self) -> List[str]:
+        """Load the facts of earlier posts, oldest first."""
+        if not self.posted_facts_file.exists():
+            return []
+        try:
+            return read_ndjson(self.posted_facts_file)
+        except Exception as e:
+            logger.warning(f"Failed to load posted facts: {e}")
+            return []
+
+    def _save_posted_fact(self, fact: str):
+        """Append the fact of a published post to the posted facts file."""
+        self.posted_facts.append(fact)
+        try:
+            append_ndjson(self.posted_facts_file, fact)
+        except Exception as e:
+            logger.error(f"Failed to save posted fact: {e}")
+
+    def record_post(self, content: Dict[str, Any]):
+        """Marks a successfully posted article as used and remembers its fact."""
+        self._save_used_article(content["article_url"])
+        self._save_posted_fact(content["fact"])
+
     def load_topics_from_file(self, filepath: Path):
         try:
-            with open(filepath, 'r') as f:
-                self.topics = [line.strip() for line in f if line.strip()]
+            self.topics = list(read_topics_file(str(filepath), filepath.stat().st_mtime))
             logger.info(f"Loaded {len(self.topics)} topics from {filepath}")
         except FileNotFoundError:
             logger.error(f"Topics file not found at {filepath}. Please create it.")
             self.topics = ["Artificial Intelligence"] # Default topic
 
     def get_daily_topic(self) -> str:
-        """Selects a topic based on the day of the month."""
-        if not self.topics:
-            self.load_topics_from_file(Path("topics.txt"))
-        day_of_month = datetime.now().day
-        return self.topics[(day_of_month - 1) % len(self.topics)]
+        """Selects a topic based on the day of the month, computed once per run."""
+        if self._daily_topic is None:
+            if not self.topics:
+                self.load_topics_from_file(Path("topics.txt"))
+            day_of_month = self._run_started_at.day
+            self._daily_topic = self.topics[(day_of_month - 1) % len(self.topics)]
+        return self._daily_topic
 
-    def get_and_save_daily_content(self, generate_image: bool = True, human_like: bool = False, plug: bool = False) -> Dict[str, Any]:
+    def get_and_save_daily_content(self, generate_image: bool = True, human_like: bool = False, plug: bool = False,
+                                   logo_path: Optional[Path] = None) -> Dict[str, Any]:
         """
         Generates and saves the daily fact, post, and optionally an image.
         
@@ -658,6 +1010,7 @@ class DailyKnowledgeService:
             generate_image: If True, generates an image for the topic.
             human_like: If True, generates a more personal, conversational post
             plug: If True, adds a promotional line about the LinkedIn bot
+            logo_path: If given, this logo is added to the generated image
             
         Returns:
             A dictionary containing the generated content and the article URL.
@@ -667,19 +1020,197 @@ class DailyKnowledgeService:
             raise ValueError("No topic selected")
         
         logger.info(f"Selected topic: {topic}")
+        return self.get_and_save_content(topic, generate_image, human_like, plug, logo_path=logo_path)
+
+    def get_and_save_many(self, topics: List[str], max_concurrency: int = 5, generate_image: bool = False,
+                          human_like: bool = False, plug: bool = False,
+                          logo_path: Optional[Path] = None) -> List[Dict[str, Any]]:
+        """
+        Generates and saves content for several topics concurrently.
+        
+        At most max_concurrency topics are processed at once to stay within the
+        APIs' rate limits. Files are tagged with the topic so they don't collide.
+        
+        Args:
+            topics: The topics to generate content for
+            max_concurrency: Maximum number of topics processed at the same time
+            generate_image: If True, generates an image for each topic.
+            human_like: If True, generates more personal, conversational posts
+            plug: If True, adds a promotional line about the LinkedIn bot
+            logo_path: If given, this logo is added to each generated image
+            
+        Returns:
+            The generated content for each topic that succeeded, in input order.
+        """
+        results = []
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            futures = [
+                executor.submit(self.get_and_save_content, topic, generate_image, human_like, plug,
+                                file_tag=topic, logo_path=logo_path)
+                for topic in topics
+            ]
+            for topic, future in zip(topics, futures):
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    logger.error(f"Failed to generate content for topic '{topic}': {e}")
+        return results
+
+    def get_and_save_content(self, topic: str, generate_image: bool = True, human_like: bool = False,
+                             plug: bool = False, file_tag: Optional[str] = None,
+                             logo_path: Optional[Path] = None) -> Dict[str, Any]:
+        """
+        Generates and saves the fact, post, and optionally an image for a topic.
+        
+        Args:
+            topic: The topic to generate content for
+            generate_image: If True, generates an image for the topic.
+            human_like: If True, generates a more personal, conversational post
+            plug: If True, adds a promotional line about the LinkedIn bot
+            file_tag: Optional text added to the saved file names
+            logo_path: If given, this logo is added to the generated image
+            
+        Returns:
+            A dictionary containing the generated content and the article URL.
+        """
+        # Image generation and watermarking only depend on the topic, so run them
+        # in the background while the Perplexity calls below are in flight.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            image_future = None
+            if generate_image and self.image_client:
+                image_future = executor.submit(self._generate_image, topic, logo_path)
+            
+            article_url, fact, post_text, pending_writes = self._generate_text_content(topic, human_like, plug, file_tag)
+            
+            image_path = image_future.result() if image_future else None
+
+        # Surface any file write errors only once everything else has finished
+        for write_future in pending_writes:
+            write_future.result()
+
+        return {
+            "topic": topic,
+            "fact": fact,
+            "post_text": post_text,
+            "image_path": image_path,
+            "article_url": article_url
+        }
+
+    def _generate_image(self, topic: str, logo_path: Optional[Path]) -> Optional[Path]:
+        """Generates the image for a topic and adds the logo to it if a logo path is given."""
+        image_path = self._find_todays_image(topic)
+        if image_path:
+            logger.info(f"Reusing today's image for topic '{topic}': {image_path}")
+        else:
+            image_path = self.image_client.generate_image(topic, self.images_dir, timestamp=self._run_ts)
+        if not image_path:
+            return None
+        # Keep the generated image untouched so a re-run can process it again;
+        # both branches below upload a JPEG copy
+        if logo_path:
+            logo_output_path = image_path.with_name(f"{image_path.stem}_logo.jpg")
+            logo_image_path = add_logo_to_image(image_path, logo_path, logo_output_path)
+            if logo_image_path:
+                return logo_image_path
+        return compress_for_upload(image_path, image_path.with_name(f"{image_path.stem}_upload.jpg"))
+
+    def _find_todays_image(self, topic: str) -> Optional[Path]:
+        """Returns the latest image generated for the topic today, if any (e.g. from a preview run)."""
+        day = self._run_started_at.strftime("%Y%m%d")
+        # Generated images end in the HHMMSS of their run; derived copies such as
+        # *_logo.jpg have a longer stem and don't match
+        candidates = [
+            path for path in self.images_dir.glob(f"{slugify(topic)}_{day}_{'[0-9]' * 6}.*")
+            if path.suffix in GeminiImageClient.EXTENSIONS.values()
+        ]
+        return max(candidates, default=None)
+
+    def _write_in_background(self, path: Path, text: str, description: str) -> Future:
+        """Schedules a text file write on the I/O pool and logs when it completes."""
+        def log_saved(f: Future):
+            if f.exception() is None:
+                if f.result():
+                    logger.info(f"{description} saved to {path}")
+                else:
+                    logger.info(f"{description} unchanged at {path}")
+
+        future = self._io_pool.submit(write_text_if_changed, path, text)
+        future.add_done_callback(log_saved)
+        return future
+
+    def _find_similar_fact(self, fact: str) -> Optional[str]:
+        """
+        Looks for a recently posted fact that says nearly the same thing.
+        
+        Facts are compared by the Jaccard similarity of their word trigrams,
+        which catches rewordings of the same point, not only exact copies.
+        Only facts that were posted count; saved drafts from previews and
+        --batch runs are never compared against.
+        
+        Args:
+            fact: The new fact
+            
+        Returns:
+            Optional[str]: The similar posted fact, or None if there is none
+        """
+        fact_shingles = word_shingles(fact)
+        if not fact_shingles:
+            return None
         
-        # Get article URL that hasn't been used before
-        article_url = self.perplexity_client.get_article_url(topic, self.used_urls)
-        if not article_url:
-            raise ValueError("Could not find a suitable article for the topic")
+        for other_fact in reversed(self.posted_facts):
+            other_shingles = word_shingles(other_fact)
+            if not other_shingles:
+                continue
+            similarity = len(fact_shingles & other_shingles) / len(fact_shingles | other_shingles)
+            if similarity >= self.DUPLICATE_FACT_SIMILARITY:
+                return other_fact
+        return None
+
+    def _generate_text_content(self, topic: str, human_like: bool, plug: bool,
+                               file_tag: Optional[str] = None) -> Tuple[str, str, str, List[Future]]:
+        """
+        Runs the Perplexity steps for a topic and schedules the fact and post file writes.
         
-        logger.info(f"Step 1: Found article: {article_url}")
+        Returns:
+            The article URL, fact and post text, plus the pending file writes.
+        """
+        file_suffix = f"_{slugify(file_tag)}" if file_tag else ""
+        # Find and summarize an unused article in one request where possible
+        found = self.perplexity_client.get_article_and_summary(topic, self.used_urls, self.recent_urls)
+        if found:
+            article_url, fact = found
+            logger.info(f"Steps 1-2: Found and summarized article: {article_url}")
+        else:
+            # Get article URL that hasn't been used before
+            article_url = self.perplexity_client.get_article_url(topic, self.used_urls, self.recent_urls)
+            if not article_url:
+                raise ValueError("Could not find a suitable article for the topic")
+            
+            logger.info(f"Step 1: Found article: {article_url}")
+            
+            logger.info("Step 2: Summarizing article...")
+            fact = self.perplexity_client.summarize_article(article_url)
+        fact_file = self.facts_dir / f"daily_fact_{self._run_date}{file_suffix}.txt"
         
-        logger.info("Step 2: Summarizing article...")
-        fact = self.perplexity_client.summarize_article(article_url)
-        fact_file = self.facts_dir / f"daily_fact_{date.today().isoformat()}.txt"
-        fact_file.write_text(fact, encoding='utf-8')
-        logger.info(f"Fact saved to {fact_file}")
+        # Topics come round again, and the model often finds a different article
+        # making the same point; try one other article before repeating ourselves
+        similar_fact = self._find_similar_fact(fact)
+        if similar_fact:
+            logger.warning(f"Fact from {article_url} repeats an earlier post ({similar_fact[:80]}...), "
+                           "looking for another article")
+            # Exclude the repeated article for this run only; articles are marked as
+            # used once they are posted
+            excluded_urls = self.used_urls | {article_url}
+            other_url = self.perplexity_client.get_article_url(topic, excluded_urls, [*self.recent_urls, article_url])
+            if other_url:
+                article_url = other_url
+                logger.info(f"Step 1 (retry): Found article: {article_url}")
+                fact = self.perplexity_client.summarize_article(article_url)
+                if self._find_similar_fact(fact):
+                    logger.warning(f"Fact from {article_url} also repeats an earlier post; using it anyway")
+            else:
+                logger.warning("No other article found; using the repeated fact")
+        fact_future = self._write_in_background(fact_file, fact, "Fact")
 
         logger.info(f"Step 3: Generating {'human-like ' if human_like else ''}LinkedIn post text for topic: {topic}")
         post_text = self.perplexity_client.generate_linkedin_post_text(
@@ -693,58 +1224,239 @@ class DailyKnowledgeService:
         if plug:
             plug_line = "\n\n--\nPosted with Linkedin Bot https://linkedin-bot-automated-c-nkrtmnz.gamma.site/"
             post_text += plug_line
-        post_file = self.linkedin_posts_dir / f"linkedin_post_{date.today().isoformat()}{'_human' if human_like else ''}.md"
-        post_file.write_text(post_text, encoding='utf-8')
-        logger.info(f"LinkedIn post text saved to {post_file}")
+        post_file = self.linkedin_posts_dir / f"linkedin_post_{self._run_date}{file_suffix}{'_human' if human_like else ''}.md"
+        post_future = self._write_in_background(post_file, post_text, "LinkedIn post text")
 
-        image_path = None
-        if generate_image:
-            image_path = self.image_client.generate_image(topic, self.images_dir)
+        return article_url, fact, post_text, [fact_future, post_future]
 
-        return {
-            "topic": topic,
-            "fact": fact,
-            "post_text": post_text,
-            "image_path": image_path,
-            "article_url": article_url
-        }
+# --- Helper Functions ---
+# Formats Pillow tries when opening images, instead of probing every registered plugin
+IMAGE_FORMATS = ["PNG", "JPEG"]
 
-def add_logo_to_image(base_image_path: Path, logo_path: Path, output_path: Path):
-    """Overlays a logo onto the bottom-right corner of a base image."""
+@functools.lru_cache(maxsize=4)
+def read_topics_file(filepath: str, mtime: float) -> Tuple[str, ...]:
+    """
+    Reads the non-empty, stripped lines of a topics file.
+    
+    The file's modification time is part of the cache key, so repeated loads
+    within a process reuse the parsed topics until the file changes.
+    """
+    lines = (line.strip() for line in Path(filepath).read_text(encoding="utf-8").splitlines())
+    return tuple(line for line in lines if line)
+
+def write_text_if_changed(path: Path, text: str) -> bool:
+    """
+    Writes text to a UTF-8 file unless the file already holds exactly that text.
+    
+    Re-runs on the same day mostly reproduce cached content, so this avoids
+    rewriting identical files (and touching their modification time). The new
+    content is written to a temporary file and swapped in, so readers never
+    see a half-written file.
+    
+    Returns:
+        bool: True if the file was written, False if it was already up to date
+    """
+    data = text.encode("utf-8")
     try:
-        logger.info(f"Opening base image: {base_image_path}")
-        base_image = Image.open(base_image_path).convert("RGBA")
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except FileNotFoundError:
+        pass
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+            # Make sure the data is on disk before the rename, or a power loss
+            # could leave the target renamed but empty
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return True
+
+def read_ndjson(path: Path) -> List[Any]:
+    """
+    Reads a file with one JSON value per line, oldest first.
+    
+    A damaged line (e.g. one torn by a crash mid-append) is skipped with a
+    warning, so the rest of the file is kept.
+    """
+    values = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                values.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                logger.warning(f"Skipping malformed line {line_number} in {path}: {e}")
+    return values
+
+def append_ndjson(path: Path, value: Any):
+    """Appends one JSON value as a new line to the file, creating it if needed."""
+    with open(path, 'ab+') as f:
+        # Start on a fresh line if a previous append was cut short, so the
+        # new entry isn't glued onto the torn one
+        f.seek(0, os.SEEK_END)
+        prefix = b""
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            prefix = b"" if f.read(1) == b"\n" else b"\n"
+        f.write(prefix + f"{json.dumps(value)}\n".encode("utf-8"))
+
+LOGO_CACHE_DIR = Path.home() / ".cache" / "linkedin-bot"
+# Batch runs watermark images from several threads; this keeps them from resizing
+# the same logo twice or reading a cached file while another thread is writing it
+_logo_lock = threading.Lock()
+
+def load_resized_logo(logo_path: Path, logo_width: int) -> "Image.Image":
+    """
+    Loads the logo scaled to the given width, reusing a cached copy where possible.
+    
+    Within a process the decoded logo is memoized per width; across runs the
+    scaled logo is stored in LOGO_CACHE_DIR under a name derived from the logo's
+    resolved path, size and modification time, so a replaced logo or one from
+    another checkout never picks up a stale copy. The returned image is shared,
+    so callers must not modify it.
+    
+    Args:
+        logo_path: Path to the source logo image
+        logo_width: Target width in pixels; the height keeps the logo's aspect ratio
         
-        logger.info(f"Opening logo image: {logo_path}")
-        logo = Image.open(logo_path).convert("RGBA")
+    Returns:
+        Image.Image: The resized logo in RGBA mode
+    """
+    logo_path = logo_path.resolve()
+    logo_stat = logo_path.stat()
+    with _logo_lock:
+        return _load_resized_logo(logo_path, logo_width, logo_stat.st_size, logo_stat.st_mtime_ns)
+
+@functools.lru_cache(maxsize=8)
+def _load_resized_logo(logo_path: Path, logo_width: int, logo_size: int, logo_mtime_ns: int) -> "Image.Image":
+    from PIL import Image
+
+    logo_key = hashlib.blake2b(f"{logo_path}:{logo_size}:{logo_mtime_ns}".encode("utf-8"), digest_size=8).hexdigest()
+    cache_path = LOGO_CACHE_DIR / f"{logo_path.stem}_{logo_key}_{logo_width}.png"
+    if cache_path.exists():
+        logger.info(f"Using cached logo: {cache_path}")
+        return Image.open(cache_path, formats=IMAGE_FORMATS).convert("RGBA")
+
+    logger.info(f"Opening logo image: {logo_path}")
+    logo = Image.open(logo_path, formats=IMAGE_FORMATS).convert("RGBA")
+    logo_ratio = logo_width / float(logo.size[0])
+    logo_height = int(float(logo.size[1]) * float(logo_ratio))
+    # reducing_gap box-downsamples large logos first; BICUBIC is indistinguishable from
+    # LANCZOS at watermark size and roughly twice as fast. When the logo shrinks by
+    # less than half, BILINEAR's smaller kernel is enough for flat logo artwork.
+    resample = Image.Resampling.BILINEAR if logo_ratio >= 0.5 else Image.Resampling.BICUBIC
+    logo = logo.resize((logo_width, logo_height), resample, reducing_gap=2.0)
+
+    try:
+        LOGO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Swap the file in once it is complete, so another run never reads a partial PNG
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        logo.save(tmp_path, "PNG")
+        os.replace(tmp_path, cache_path)
+    except Exception as e:
+        logger.warning(f"Failed to cache resized logo: {e}")
+    return logo
+
+# Settings for JPEGs written for upload: visually lossless for generated photos
+# and several times smaller than the equivalent PNG
+JPEG_SAVE_OPTIONS = {"quality": 88, "optimize": True, "progressive": True}
+
+def save_as_jpeg(image: "Image.Image", output_path: Path) -> Path:
+    """Saves an image as an optimized JPEG at output_path with a .jpg suffix and returns that path."""
+    jpg_path = output_path.with_suffix(".jpg")
+    # convert() copies the image even when the mode already matches, and JPEG
+    # cannot store alpha anyway, so only non-RGB images need converting
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    image.save(jpg_path, "JPEG", **JPEG_SAVE_OPTIONS)
+    return jpg_path
+
+def compress_for_upload(image_path: Path, output_path: Path, max_bytes: int = 512 * 1024) -> Path:
+    """
+    Returns a JPEG copy of a large PNG for uploading, or the image itself if it is already small.
+    
+    LinkedIn re-encodes uploaded images anyway, so sending a multi-megabyte
+    PNG only makes the upload slower.
+    
+    Args:
+        image_path: The generated image
+        output_path: Where to write the JPEG copy (its suffix is replaced with .jpg)
+        max_bytes: PNGs up to this size are uploaded as they are
+        
+    Returns:
+        Path: The file to upload
+    """
+    if image_path.suffix.lower() != ".png" or image_path.stat().st_size <= max_bytes:
+        return image_path
+    from PIL import Image
+
+    try:
+        with Image.open(image_path, formats=IMAGE_FORMATS) as image:
+            jpg_path = save_as_jpeg(image, output_path)
+    except Exception as e:
+        logger.warning(f"Could not compress {image_path} for upload: {e}")
+        return image_path
+    logger.info(f"Compressed {image_path} for upload to {jpg_path}")
+    return jpg_path
+
+def add_logo_to_image(base_image_path: Path, logo_path: Path, output_path: Optional[Path] = None) -> Optional[Path]:
+    """
+    Overlays a logo onto the bottom-right corner of a base image.
+    
+    The result is written as an optimized JPEG next to output_path (with a .jpg
+    suffix), which is far smaller to upload than a PNG of a generated photo.
+    output_path defaults to the base image's path.
+    
+    Returns:
+        Optional[Path]: Path of the saved JPEG, or None if the logo could not be added
+    """
+    from PIL import Image
+
+    output_path = output_path or base_image_path
+    try:
+        logger.info(f"Opening base image: {base_image_path}")
+        base_image = Image.open(base_image_path, formats=IMAGE_FORMATS)
+        if base_image.mode not in ("RGB", "RGBA"):
+            # Only keep an alpha plane if the source actually has transparency
+            has_alpha = base_image.mode in ("LA", "PA") or "transparency" in base_image.info
+            base_image = base_image.convert("RGBA" if has_alpha else "RGB")
 
         # Resize logo to be 20% of the base image's width
         base_width, base_height = base_image.size
-        logo_width = int(base_width * 0.20)
-        logo_ratio = logo_width / float(logo.size[0])
-        logo_height = int(float(logo.size[1]) * float(logo_ratio))
-        logo = logo.resize((logo_width, logo_height), Image.Resampling.LANCZOS)
+        logo = load_resized_logo(logo_path, int(base_width * 0.20))
+        logo_width, logo_height = logo.size
 
         # Position logo at the bottom-right with 2% padding
         padding_x = int(base_width * 0.02)
         padding_y = int(base_height * 0.02)
         position = (base_width - logo_width - padding_x, base_height - logo_height - padding_y)
 
-        # Create a transparent layer to paste the logo on
-        transparent_layer = Image.new("RGBA", base_image.size, (0, 0, 0, 0))
-        transparent_layer.paste(logo, position)
-
-        # Composite the base image with the logo layer
-        watermarked_image = Image.alpha_composite(base_image, transparent_layer)
+        # Blend the logo in place, so only the pixels under the logo are touched
+        # instead of compositing a full-size transparent layer over the canvas.
+        # alpha_composite needs an RGBA base; converting an RGB one would copy the
+        # whole image, so those paste with the logo's alpha as the mask instead
+        # (same result over an opaque base).
+        if base_image.mode == "RGBA":
+            base_image.alpha_composite(logo, dest=position)
+        else:
+            base_image.paste(logo, position, logo)
 
-        # Save the final image, replacing the original
-        watermarked_image.convert("RGB").save(output_path)
-        logger.info(f"Successfully added logo and saved to: {output_path}")
+        # Save the final image as an optimized JPEG
+        jpg_path = save_as_jpeg(base_image, output_path)
+        logger.info(f"Successfully added logo and saved to: {jpg_path}")
+        return jpg_path
 
     except FileNotFoundError:
         logger.error(f"Error: Logo file not found at '{logo_path}'. Please ensure it exists.")
     except Exception as e:
         logger.error(f"Could not add logo to image: {e}")
+    return None
 
 def print_summary(topic: str, fact: str, post_text: str, image_path: Optional[Path] = None):
     """Prints a summary of the generated content to the console."""
@@ -763,20 +1475,34 @@ def main():
     parser.add_argument("--no-logo", action="store_true", help="Skip adding the brand logo to the image.")
     parser.add_argument("--human", action="store_true", help="Generate a more personal, human-like post.")
     parser.add_argument("--plug", action="store_true", help="Add a promotional line about the LinkedIn bot.")
+    parser.add_argument("--batch", action="store_true", help="Pre-generate content for every topic in topics.txt (does not post).")
     args = parser.parse_args()
 
+    if args.batch and args.post_to_linkedin:
+        parser.error("--batch cannot be combined with --post-to-linkedin")
+
     # Load configuration from .env file
     load_dotenv()
 
     # Initialize clients
     try:
-        perplexity_client = PerplexityClient(api_key=os.getenv("PERPLEXITY_API_KEY"))
-        
-        # Initialize Gemini image client
-        image_client = GeminiImageClient(
-            api_key=os.getenv("GOOGLE_API_KEY")
+        max_concurrency = os.getenv("PERPLEXITY_MAX_CONCURRENCY", "4")
+        try:
+            max_concurrency = int(max_concurrency)
+        except ValueError:
+            raise ConfigurationError(f"PERPLEXITY_MAX_CONCURRENCY must be a whole number, got '{max_concurrency}'.")
+        perplexity_client = PerplexityClient(
+            api_key=os.getenv("PERPLEXITY_API_KEY"),
+            max_concurrency=max_concurrency
         )
-        logger.info("Using Google Gemini for image generation")
+        
+        # Initialize Gemini image client only when an image was requested
+        image_client = None
+        if args.add_image:
+            image_client = GeminiImageClient(
+                api_key=os.getenv("GOOGLE_API_KEY")
+            )
+            logger.info("Using Google Gemini for image generation")
         
         linkedin_client = None
         if args.post_to_linkedin:
@@ -785,6 +1511,8 @@ def main():
                 person_id=os.getenv("LINKEDIN_PERSON_ID"),
                 organization_id=os.getenv("LINKEDIN_ORGANIZATION_ID")
             )
+            # Fail before any content is generated rather than at posting time
+            linkedin_client.require_author(args.company)
 
         service = DailyKnowledgeService(perplexity_client, image_client, linkedin_client)
 
@@ -792,12 +1520,30 @@ def main():
         logger.error(f"Configuration error: {e}")
         sys.exit(1)
 
+    # Brand logo added to generated images unless disabled
+    logo_path = None if args.no_logo else Path("brand_logo.png")
+
+    if args.batch:
+        service.load_topics_from_file(Path("topics.txt"))
+        results = service.get_and_save_many(
+            service.topics,
+            generate_image=args.add_image,
+            human_like=args.human,
+            plug=args.plug,
+            logo_path=logo_path
+        )
+        for content in results:
+            print_summary(content["topic"], content["fact"], content["post_text"], content.get("image_path"))
+        logger.info(f"Generated content for {len(results)} of {len(service.topics)} topics.")
+        return
+
     # Generate content
     try:
         content = service.get_and_save_daily_content(
             generate_image=args.add_image,
             human_like=args.human,
-            plug=args.plug
+            plug=args.plug,
+            logo_path=logo_path
         )
     except Exception as e:
         logger.error(f"Failed to generate content: {e}")
@@ -807,11 +1553,6 @@ def main():
         logger.error("Failed to generate content. Exiting.")
         sys.exit(1)
 
-    # Add logo to the image if it was generated and not disabled
-    if content.get("image_path") and not args.no_logo:
-        logo_path = Path("brand_logo.png")
-        add_logo_to_image(content["image_path"], logo_path, content["image_path"]) # Overwrite original
-
     # Post to LinkedIn if requested
     if args.post_to_linkedin:
         if not service.linkedin_client:
@@ -825,18 +1566,20 @@ def main():
             print(f"\n[Image will be attached: {content['image_path']}]")
         print("\n" + "-" * 30 + "\n")
 
-        # Confirm before posting
+        # Confirm before posting. The image is only uploaded once the user agrees,
+        # so a refusal leaves nothing behind on LinkedIn.
+        image_path = content.get("image_path") if args.add_image else None
         user_input = input("Do you want to post the above content to LinkedIn? (y/n): ")
+
         if user_input.lower() == 'y':
             try:
-                image_path = content.get("image_path") if args.add_image else None
                 if args.company:
-                    service.linkedin_client.post_as_company(content["post_text"], image_path)
+                    service.linkedin_client.post_as_company(content["post_text"], image_path=image_path)
                 else:
-                    service.linkedin_client.post_as_person(content["post_text"], image_path)
+                    service.linkedin_client.post_as_person(content["post_text"], image_path=image_path)
                 
                 # Only mark the article as used if the post was successful
-                service._save_used_article(content["article_url"])
+                service.record_post(content)
                 logger.info("Successfully posted to LinkedIn and updated used articles list!")
             except LinkedInError as e:
                 logger.error(f"Failed to post to LinkedIn: {e}")